@@ -20,6 +20,7 @@ from docx import Document
 from typing import List, Tuple, Dict
 from PIL import Image
 import io
+from pipeline_profiler import PipelineProfiler, StackSampler, DebugTextSink
 
 import warnings
 warnings.filterwarnings('ignore')
@@ -36,7 +37,19 @@ logger.addHandler(file_handler)
 
 # Debug output folder for extracted text
 DEBUG_TEXT_DIR = Path("logs") / "extracted_text"
-DEBUG_TEXT_DIR.mkdir(parents=True, exist_ok=True)
+
+# Profiling output folder
+PROFILE_DIR = Path("logs") / "profile"
+
+# Profiler and debug-text sink; disabled by default, turned on with setup_profiling()
+PROFILER = PipelineProfiler(enabled=False, logger=logger)
+DEBUG_SINK = DebugTextSink(DEBUG_TEXT_DIR, enabled=False, logger=logger)
+
+
+def setup_profiling(profile: bool = False, debug_text: bool = False, debug_text_max_mb: float = 50) -> None:
+    """Enable stage profiling and/or the extracted-text debug sink for this process"""
+    PROFILER.enabled = profile
+    DEBUG_SINK.configure(debug_text, max_bytes=int(debug_text_max_mb * 1024 * 1024))
 
 # Suppress verbose transformers/huggingface logging
 logging.getLogger('transformers').setLevel(logging.ERROR)
@@ -63,28 +76,22 @@ OUTPUT_FILE = r"/mnt/d/Beyond_College/GITHUB/Resume_Screener_Basic/Combined_Resu
 # ============================================================================
 
 def save_extracted_text(file_path: str, text: str, debug_name: str | None = None) -> None:
-    """Save extracted text to debug folder using the source filename."""
-    if not text:
+    """Queue extracted text for the debug sink (only when enabled with --debug-text)."""
+    if not text or not DEBUG_SINK.enabled:
         return
-    try:
-        src_path = Path(file_path)
-        name_source = Path(debug_name) if debug_name else src_path
-        safe_name = name_source.stem or "extracted"
-        ext = name_source.suffix.lower().lstrip('.') or "file"
-        timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
-        debug_file = DEBUG_TEXT_DIR / f"{safe_name}_{ext}_{timestamp}.txt"
-        debug_file.write_text(text, encoding="utf-8")
-    except Exception as e:
-        logger.warning(f"Failed to save extracted text for {file_path}: {e}")
+    with PROFILER.stage('save'):
+        DEBUG_SINK.write(file_path, text, name=debug_name)
 
 def extract_text_from_pdf(file_path: str) -> str:
     """Extract text from PDF files"""
     try:
         text = ""
         with open(file_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text() or ""
+            with PROFILER.stage('read'):
+                reader = PyPDF2.PdfReader(f)
+            with PROFILER.stage('parse'):
+                for page in reader.pages:
+                    text += page.extract_text() or ""
         text = text.strip()
         save_extracted_text(file_path, text)
         return text
@@ -95,8 +102,10 @@ def extract_text_from_pdf(file_path: str) -> str:
 def extract_text_from_docx(file_path: str) -> str:
     """Extract text from DOCX files"""
     try:
-        doc = Document(file_path)
-        text = "\n".join([para.text for para in doc.paragraphs])
+        with PROFILER.stage('read'):
+            doc = Document(file_path)
+        with PROFILER.stage('parse'):
+            text = "\n".join([para.text for para in doc.paragraphs])
         text = text.strip()
         save_extracted_text(file_path, text)
         return text
@@ -122,23 +131,28 @@ def extract_text_from_image(file_path: str) -> str:
 
         if file_ext == '.gif':
             logger.debug(f"Converting GIF to JPG for OCR: {file_path}")
-            with Image.open(file_path) as img:
-                if img.mode not in ("RGB", "L"):
-                    img = img.convert("RGB")
-                else:
-                    img = img.convert("RGB")
-                buffer = io.BytesIO()
-                img.save(buffer, format="JPEG")
-                buffer.seek(0)
-
-                logger.debug("Sending converted JPG to OCR API")
-                files = {'file': (f"{Path(file_path).stem}.jpg", buffer, 'image/jpeg')}
+            with PROFILER.stage('read'):
+                with Image.open(file_path) as img:
+                    if img.mode not in ("RGB", "L"):
+                        img = img.convert("RGB")
+                    else:
+                        img = img.convert("RGB")
+                    buffer = io.BytesIO()
+                    img.save(buffer, format="JPEG")
+                    buffer.seek(0)
+
+            logger.debug("Sending converted JPG to OCR API")
+            files = {'file': (f"{Path(file_path).stem}.jpg", buffer, 'image/jpeg')}
+            with PROFILER.stage('ocr'):
                 response = requests.post('http://localhost:8001/ocr', files=files, timeout=60)
         else:
             content_type = content_type_map.get(file_ext, 'image/png')
             logger.debug(f"Sending image {file_path} with content-type: {content_type}")
-            with open(file_path, 'rb') as f:
-                files = {'file': (Path(file_path).name, f, content_type)}
+            with PROFILER.stage('read'):
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            files = {'file': (Path(file_path).name, data, content_type)}
+            with PROFILER.stage('ocr'):
                 response = requests.post('http://localhost:8001/ocr', files=files, timeout=60)
         
         if response.status_code == 200:
@@ -182,13 +196,15 @@ def load_dataset1() -> List[Tuple[str, str]]:
     logger.info(f"Loading Dataset1 from {Dataset1}...")
     data = []
     try:
-        df = pd.read_csv(Dataset1)
+        with PROFILER.stage('read', dataset='Dataset1'):
+            df = pd.read_csv(Dataset1)
         
-        for idx, row in df.iterrows():
-            category = str(row['Category']).strip()
-            resume = str(row['Resume']).strip()
-            if category and resume:
-                data.append((category, resume))
+        with PROFILER.stage('parse', dataset='Dataset1'):
+            for idx, row in df.iterrows():
+                category = str(row['Category']).strip()
+                resume = str(row['Resume']).strip()
+                if category and resume:
+                    data.append((category, resume))
         
         logger.info(f"✓ Dataset1: Loaded {len(data)} records")
     except Exception as e:
@@ -201,13 +217,15 @@ def load_dataset2() -> List[Tuple[str, str]]:
     logger.info(f"Loading Dataset2 from {Dataset2}...")
     data = []
     try:
-        df = pd.read_csv(Dataset2)
+        with PROFILER.stage('read', dataset='Dataset2'):
+            df = pd.read_csv(Dataset2)
             
-        for idx, row in df.iterrows():
-            resume = str(row['Resume']).strip()
-            label = str(row['Label']).strip()
-            if resume and label:
-                data.append((label, resume))
+        with PROFILER.stage('parse', dataset='Dataset2'):
+            for idx, row in df.iterrows():
+                resume = str(row['Resume']).strip()
+                label = str(row['Label']).strip()
+                if resume and label:
+                    data.append((label, resume))
         
         logger.info(f"✓ Dataset2: Loaded {len(data)} records")
     except Exception as e:
@@ -249,7 +267,8 @@ def load_dataset_from_folders(dataset_path: str, dataset_name: str) -> List[Tupl
                 continue
             
             # Extract text based on file type
-            text = extract_text_from_file(file_path)
+            with PROFILER.file(file_path, dataset_name):
+                text = extract_text_from_file(file_path)
             
             if text and len(text) > 50:  # Only keep non-empty extractions
                 data.append((category, text))
@@ -352,7 +371,8 @@ def combine_all_datasets() -> pd.DataFrame:
     
     # Clean resume text
     logger.info("\nCleaning resume text...")
-    df['Resume'] = df['Resume'].apply(clean_text)
+    with PROFILER.stage('clean', dataset='all'):
+        df['Resume'] = df['Resume'].apply(clean_text)
     
     # Remove duplicates
     logger.info("Removing duplicates...")
@@ -395,7 +415,8 @@ def save_dataset(df: pd.DataFrame, output_path: str = OUTPUT_FILE) -> bool:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
         # Save to CSV
-        df.to_csv(output_path, index=False, encoding='utf-8')
+        with PROFILER.stage('save', dataset='all'):
+            df.to_csv(output_path, index=False, encoding='utf-8')
         
         logger.info(f"✓ Dataset saved successfully!")
         logger.info(f"  File size: {os.path.getsize(output_path) / 1024 / 1024:.2f} MB")
@@ -412,6 +433,25 @@ def save_dataset(df: pd.DataFrame, output_path: str = OUTPUT_FILE) -> bool:
 # ============================================================================
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Combine resume datasets into a single CSV")
+    parser.add_argument('--profile', action='store_true',
+                        help=f"Record per-file stage timings; writes summary.txt, file_timings.csv and trace.json to {PROFILE_DIR}")
+    parser.add_argument('--sample', action='store_true',
+                        help="Also run the sampling profiler (writes samples.folded for speedscope)")
+    parser.add_argument('--sample-interval', type=float, default=0.005, help="Sampling interval in seconds")
+    parser.add_argument('--debug-text', action='store_true',
+                        help=f"Dump extracted text to a batched JSONL file in {DEBUG_TEXT_DIR}")
+    parser.add_argument('--debug-text-max-mb', type=float, default=50, help="Size cap for --debug-text output")
+    args = parser.parse_args()
+
+    setup_profiling(profile=args.profile or args.sample, debug_text=args.debug_text,
+                    debug_text_max_mb=args.debug_text_max_mb)
+    sampler = StackSampler(args.sample_interval, logger=logger) if args.sample else None
+    if sampler:
+        sampler.start()
+
     try:
         # Combine all datasets
         combined_df = combine_all_datasets()
@@ -434,4 +474,10 @@ if __name__ == "__main__":
     except Exception as e:
         logger.error(f"\n❌ Fatal error: {e}")
         import traceback
-        traceback.print_exc()
\ No newline at end of file
+        traceback.print_exc()
+    finally:
+        DEBUG_SINK.close()
+        if sampler:
+            sampler.stop()
+            sampler.write(str(PROFILE_DIR / "samples.folded"))
+        PROFILER.write(str(PROFILE_DIR))
\ No newline at end of file
@@ -1,5 +1,8 @@
+import os
 import pickle
+from typing import List
 from utils import *
+from linear_scorer import LinearScorer
 from pydantic import BaseModel
 from fastapi import FastAPI, HTTPException
 
@@ -7,6 +10,10 @@ from fastapi import FastAPI, HTTPException
 class ResumeRequest(BaseModel):
     resume_text: str
 
+# Set Batch Resume Request Model
+class BatchResumeRequest(BaseModel):
+    resume_texts: List[str]
+
 # Initialize FastAPI app
 app = FastAPI()
 
@@ -15,18 +22,46 @@ pred_model = pickle.load(open('clf.pkl', 'rb'))
 tfidf = pickle.load(open('tfidf.pkl', 'rb'))
 label_encoder = pickle.load(open('encoder.pkl', 'rb'))
 
+# Optional fused TF-IDF + linear model kernel (set RSB_FUSED_SCORER=1), only for linear models
+scorer = None
+if os.environ.get('RSB_FUSED_SCORER') == '1':
+    try:
+        scorer = LinearScorer(tfidf, pred_model)
+    except ValueError as e:
+        print(f"Fused scorer disabled: {e}")
+
 # Prediction Route to Prediction Function
 @app.post('/predict')
 def predict_category(req: ResumeRequest):
     try:
         cleaned_text = cleanResume(req.resume_text)
-        vectorized_text = tfidf.transform([cleaned_text]).toarray()
-        pred_label = pred_model.predict(vectorized_text)
+        if scorer is not None:
+            pred_label = scorer.predict([cleaned_text])
+        else:
+            vectorized_text = tfidf.transform([cleaned_text]).toarray()
+            pred_label = pred_model.predict(vectorized_text)
         pred_category = label_encoder.inverse_transform(pred_label)
         return {"Predicted Category": pred_category[0]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
     
+# Batch Prediction Route (used by prediction_client for many resumes)
+@app.post('/predict/batch')
+def predict_category_batch(req: BatchResumeRequest):
+    try:
+        if not req.resume_texts:
+            return {"Predicted Categories": []}
+        cleaned_texts = [cleanResume(text) for text in req.resume_texts]
+        if scorer is not None:
+            pred_labels = scorer.predict(cleaned_texts)
+        else:
+            vectorized_text = tfidf.transform(cleaned_texts).toarray()
+            pred_labels = pred_model.predict(vectorized_text)
+        pred_categories = label_encoder.inverse_transform(pred_labels)
+        return {"Predicted Categories": [str(c) for c in pred_categories]}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Root Route
 @app.get('/')
 def root_greeting():
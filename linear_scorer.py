@@ -0,0 +1,245 @@
+"""
+Fused TF-IDF + linear classifier scoring kernel
+
+For a linear model the whole vectorize-and-predict path
+    tfidf.transform -> OneVsRestClassifier.predict
+can be folded into a single term-by-class weight matrix:
+
+    score = (tf @ (idf[:, None] * coef.T)) / ||tf * idf|| + intercept
+
+so prediction is one tokenization pass plus one sparse-dense product.
+Labels are identical to the sklearn path (argmax over per-class decision
+values). Exact ties between classes are not guaranteed to match: the fused
+scores are not bit-identical to sklearn's, and OneVsRestClassifier's
+tie-breaking differs across scikit-learn versions.
+
+Only linear estimators (anything exposing coef_ / intercept_, e.g.
+LogisticRegression, LinearSVC, SGDClassifier, SVC(kernel='linear')) can be
+fused. For other models LinearScorer raises ValueError and callers should
+keep using the regular sklearn path.
+
+Run `python linear_scorer.py` to check label parity and benchmark against
+the current path.
+"""
+
+import re
+import pickle
+import numpy as np
+import scipy.sparse as sp
+from typing import Iterable, List
+
+from utils import cleanResume
+
+
+class LinearScorer:
+    """Precomputed term-by-class weights built from a fitted vectorizer and classifier"""
+
+    def __init__(self, tfidf, clf):
+        if tfidf.analyzer != 'word':
+            raise ValueError(f"Unsupported analyzer for fused scoring: {tfidf.analyzer!r}")
+        if tfidf.norm not in ('l2', None):
+            raise ValueError(f"Unsupported norm for fused scoring: {tfidf.norm!r}")
+
+        coef, intercept, classes = _linear_weights(clf)
+        n_features = len(tfidf.vocabulary_)
+        if coef.shape[1] != n_features:
+            raise ValueError(
+                f"Classifier expects {coef.shape[1]} features but vectorizer has {n_features}"
+            )
+
+        idf = tfidf.idf_ if tfidf.use_idf else np.ones(n_features)
+
+        self.vocabulary = tfidf.vocabulary_
+        self.lowercase = tfidf.lowercase
+        self.binary = tfidf.binary
+        self.sublinear_tf = tfidf.sublinear_tf
+        self.norm = tfidf.norm
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.weights = np.ascontiguousarray(self.idf[:, None] * coef.T)
+        self.intercept = intercept
+        self.classes_ = classes
+
+        # Plain unigram vectorizers are tokenized with their own token pattern;
+        # anything custom (tokenizer, preprocessor, ngrams, accents) goes
+        # through sklearn's analyzer so the features always match.
+        simple = (
+            tfidf.ngram_range == (1, 1)
+            and tfidf.tokenizer is None
+            and tfidf.preprocessor is None
+            and tfidf.strip_accents is None
+        )
+        self._token_re = re.compile(tfidf.token_pattern) if simple else None
+        self._analyzer = None if simple else tfidf.build_analyzer()
+        if self._token_re is not None and self._token_re.groups > 1:
+            raise ValueError("More than 1 capturing group in token pattern.")
+
+    @classmethod
+    def from_pickles(cls, tfidf_path: str = 'tfidf.pkl', clf_path: str = 'clf.pkl') -> "LinearScorer":
+        """Build the scorer from the saved tfidf.pkl and clf.pkl"""
+        with open(tfidf_path, 'rb') as f:
+            tfidf = pickle.load(f)
+        with open(clf_path, 'rb') as f:
+            clf = pickle.load(f)
+        return cls(tfidf, clf)
+
+    def _tokenize(self, text: str) -> List[str]:
+        if self._analyzer is not None:
+            return self._analyzer(text)
+        if self.lowercase:
+            text = text.lower()
+        return self._token_re.findall(text)
+
+    def term_counts(self, texts: Iterable[str]) -> sp.csr_matrix:
+        """Raw term counts (rows = texts) over the vectorizer vocabulary"""
+        vocab = self.vocabulary
+        indices = []
+        indptr = [0]
+        for text in texts:
+            for token in self._tokenize(text):
+                idx = vocab.get(token)
+                if idx is not None:
+                    indices.append(idx)
+            indptr.append(len(indices))
+
+        data = np.ones(len(indices), dtype=np.float64)
+        counts = sp.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(vocab)),
+        )
+        counts.sum_duplicates()
+        return counts
+
+    def decision_function(self, texts: Iterable[str]) -> np.ndarray:
+        """Per-class scores, shape (n_texts, n_classes)"""
+        tf = self.term_counts(texts)
+        if self.binary:
+            tf.data[:] = 1.0
+        elif self.sublinear_tf:
+            np.log(tf.data, tf.data)
+            tf.data += 1.0
+
+        scores = tf @ self.weights
+        if self.norm == 'l2':
+            weighted = tf.data * self.idf[tf.indices]
+            sq = np.zeros(tf.shape[0])
+            rows = np.repeat(np.arange(tf.shape[0]), np.diff(tf.indptr))
+            np.add.at(sq, rows, weighted * weighted)
+            norms = np.sqrt(sq)
+            norms[norms == 0.0] = 1.0
+            scores /= norms[:, None]
+        scores += self.intercept
+        return scores
+
+    def predict(self, texts: Iterable[str]) -> np.ndarray:
+        """Predicted labels (encoded, same as clf.predict)"""
+        scores = self.decision_function(texts)
+        if scores.shape[1] == 1:
+            return self.classes_[(scores[:, 0] > 0).astype(int)]
+        return self.classes_[scores.argmax(axis=1)]
+
+
+def _linear_weights(clf):
+    """Return (coef, intercept, classes) as (n_classes, n_features), (n_classes,), (n_classes,)"""
+    estimators = getattr(clf, 'estimators_', None)
+    if estimators is not None and hasattr(clf, 'label_binarizer_'):
+        # OneVsRestClassifier: stack the per-class binary estimators
+        y_type = getattr(clf.label_binarizer_, 'y_type_', None)
+        if y_type != 'multiclass':
+            raise ValueError(f"OneVsRestClassifier target type {y_type!r} is not supported for fused scoring")
+        coefs, intercepts = [], []
+        for est in estimators:
+            if not (hasattr(est, 'coef_') and hasattr(est, 'intercept_')):
+                raise ValueError(
+                    f"Estimator {type(est).__name__} is not linear; fused scoring needs coef_/intercept_"
+                )
+            coefs.append(_dense(est.coef_).ravel())
+            intercepts.append(np.ravel(est.intercept_)[0])
+        return np.vstack(coefs), np.asarray(intercepts, dtype=np.float64), np.asarray(clf.classes_)
+
+    if hasattr(clf, 'coef_') and hasattr(clf, 'intercept_'):
+        return _dense(clf.coef_), np.ravel(clf.intercept_).astype(np.float64), np.asarray(clf.classes_)
+
+    raise ValueError(f"Classifier {type(clf).__name__} is not linear; fused scoring needs coef_/intercept_")
+
+
+def _dense(coef) -> np.ndarray:
+    coef = coef.toarray() if sp.issparse(coef) else coef
+    return np.atleast_2d(np.asarray(coef, dtype=np.float64))
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def benchmark(texts: List[str], tfidf, clf, repeat: int = 5) -> dict:
+    """Compare the sklearn path and the fused scorer on the same cleaned texts"""
+    import time
+
+    scorer = LinearScorer(tfidf, clf)
+    cleaned = [cleanResume(t) for t in texts]
+
+    def sklearn_path():
+        return np.concatenate([clf.predict(tfidf.transform([t]).toarray()) for t in cleaned])
+
+    def fused_path():
+        return np.concatenate([scorer.predict([t]) for t in cleaned])
+
+    def fused_batch():
+        return scorer.predict(cleaned)
+
+    expected = sklearn_path()
+    results = {'n_texts': len(texts)}
+    for name, fn in (('sklearn', sklearn_path), ('fused', fused_path), ('fused_batch', fused_batch)):
+        labels = fn()
+        if not np.array_equal(labels, expected):
+            raise AssertionError(f"{name} labels differ from the sklearn path")
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        results[name] = best
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Benchmark the fused linear scorer against tfidf+clf")
+    parser.add_argument('--csv', help="CSV with a Resume column (e.g. Combined_Resume_Dataset.csv)")
+    parser.add_argument('--n', type=int, default=500, help="Number of resumes to score")
+    parser.add_argument('--tfidf', default='tfidf.pkl')
+    parser.add_argument('--clf', default='clf.pkl')
+    args = parser.parse_args()
+
+    with open(args.tfidf, 'rb') as f:
+        tfidf = pickle.load(f)
+
+    if args.csv:
+        texts = pd.read_csv(args.csv)['Resume'].astype(str).head(args.n).tolist()
+    else:
+        # Synthetic resumes drawn from the vectorizer vocabulary
+        rng = np.random.default_rng(0)
+        vocab = np.array(sorted(tfidf.vocabulary_))
+        texts = [' '.join(rng.choice(vocab, size=rng.integers(100, 600))) for _ in range(args.n)]
+
+    try:
+        with open(args.clf, 'rb') as f:
+            clf = pickle.load(f)
+        LinearScorer(tfidf, clf)
+    except (OSError, ValueError) as e:
+        # Saved model missing or not linear: benchmark with a linear OvR model
+        # fit on the benchmark texts so the kernel itself can still be measured.
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.multiclass import OneVsRestClassifier
+        print(f"Using a stand-in OneVsRest(LogisticRegression) model ({e})")
+        X = tfidf.transform([cleanResume(t) for t in texts])
+        y = np.arange(len(texts)) % 25
+        clf = OneVsRestClassifier(LogisticRegression(max_iter=200)).fit(X, y)
+
+    res = benchmark(texts, tfidf, clf)
+    print(f"Texts scored: {res['n_texts']} (labels identical on all paths)")
+    print(f"sklearn transform+predict: {res['sklearn'] * 1000:.1f} ms")
+    print(f"fused, one text per call:  {res['fused'] * 1000:.1f} ms ({res['sklearn'] / res['fused']:.1f}x)")
+    print(f"fused, single batch:       {res['fused_batch'] * 1000:.1f} ms ({res['sklearn'] / res['fused_batch']:.1f}x)")
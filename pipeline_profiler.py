@@ -0,0 +1,278 @@
+"""
+Profiling and debug-dump helpers for the dataset combiner (Combine_datasets.py)
+
+- PipelineProfiler: per-file timings by stage (read, parse, ocr, clean, save),
+  aggregated per stage / format / dataset, written as a summary report and a
+  Chrome trace-event JSON (open in chrome://tracing or https://ui.perfetto.dev)
+- StackSampler: optional sampling profiler that snapshots the main thread's
+  stack at a fixed interval and writes collapsed stacks (speedscope /
+  flamegraph.pl format)
+- DebugTextSink: opt-in, batched, size-capped replacement for the
+  one-file-per-extraction debug dumps in logs/extracted_text
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import List, Optional
+
+import pandas as pd
+
+_default_logger = logging.getLogger(__name__)
+
+STAGES = ('read', 'parse', 'ocr', 'clean', 'save')
+
+
+class PipelineProfiler:
+    """Collect per-file stage timings; does nothing when disabled"""
+
+    def __init__(self, enabled: bool = False, logger: Optional[logging.Logger] = None):
+        self.enabled = enabled
+        self.logger = logger or _default_logger
+        self.events: List[dict] = []
+        self.files: List[dict] = []
+        self._current: Optional[dict] = None
+        self._origin = time.perf_counter()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1e6
+
+    @contextmanager
+    def file(self, file_path: str, dataset: str):
+        """Scope stage timings to one source file"""
+        if not self.enabled:
+            yield
+            return
+        record = {
+            'file': file_path,
+            'dataset': dataset,
+            'format': Path(file_path).suffix.lower().lstrip('.') or 'none',
+            'stages': defaultdict(float),
+        }
+        self._current = record
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            record['total'] = (self._now_us() - start) / 1e6
+            self._current = None
+            self.files.append(record)
+            self.events.append({
+                'name': Path(file_path).name, 'cat': 'file', 'ph': 'X',
+                'ts': start, 'dur': record['total'] * 1e6, 'pid': 1, 'tid': 1,
+                'args': {'file': file_path, 'dataset': dataset, 'format': record['format']},
+            })
+
+    @contextmanager
+    def stage(self, name: str, dataset: Optional[str] = None):
+        """Time a stage; attributed to the current file if inside file()"""
+        if not self.enabled:
+            yield
+            return
+        record = self._current
+        start = self._now_us()
+        try:
+            yield
+        finally:
+            dur = self._now_us() - start
+            args = {}
+            if record is not None:
+                record['stages'][name] += dur / 1e6
+                args = {'file': record['file'], 'dataset': record['dataset'], 'format': record['format']}
+            elif dataset is not None:
+                args = {'dataset': dataset}
+            self.events.append({
+                'name': name, 'cat': 'stage', 'ph': 'X',
+                'ts': start, 'dur': dur, 'pid': 1, 'tid': 1, 'args': args,
+            })
+
+    def _frame(self) -> pd.DataFrame:
+        rows = []
+        for record in self.files:
+            row = {'file': record['file'], 'dataset': record['dataset'],
+                   'format': record['format'], 'total': record['total']}
+            row.update({s: record['stages'].get(s, 0.0) for s in STAGES})
+            rows.append(row)
+        return pd.DataFrame(rows, columns=['file', 'dataset', 'format', 'total', *STAGES])
+
+    def _dataset_stage_frame(self) -> pd.DataFrame:
+        """Stage time recorded at dataset level (CSV loads, whole-DataFrame clean/save), per dataset"""
+        rows = [{'dataset': e['args']['dataset'], 'stage': e['name'], 'seconds': e['dur'] / 1e6}
+                for e in self.events
+                if e['cat'] == 'stage' and 'file' not in e['args'] and 'dataset' in e['args']]
+        if not rows:
+            return pd.DataFrame(columns=list(STAGES), dtype=float)
+        frame = pd.DataFrame(rows).pivot_table(index='dataset', columns='stage', values='seconds', aggfunc='sum')
+        return frame.reindex(columns=list(STAGES), fill_value=0.0).fillna(0.0)
+
+    def summary(self, top_n: int = 20) -> str:
+        """Text report: stage totals, per-format and per-dataset aggregates, slowest files"""
+        lines = ["=" * 80, "PROFILE SUMMARY", "=" * 80]
+
+        stage_totals = Counter()
+        for event in self.events:
+            if event['cat'] == 'stage':
+                stage_totals[event['name']] += event['dur'] / 1e6
+        lines.append("\nTime by stage (s):")
+        for name, total in stage_totals.most_common():
+            lines.append(f"  {name:<10} {total:10.2f}")
+
+        df = self._frame()
+        cols = ['total', *STAGES]
+        if not df.empty:
+            agg = df.groupby('format')[cols].sum()
+            agg.insert(0, 'files', df.groupby('format').size())
+            agg['mean'] = agg['total'] / agg['files']
+            agg['max'] = df.groupby('format')['total'].max()
+            lines.append("\nPer-format (s):")
+            lines.append(agg.sort_values('total', ascending=False).round(3).to_string())
+
+        # Per-dataset: per-file stages plus dataset-level stages; 'dataset_level' is the latter's share
+        per_file = df.groupby('dataset')[cols].sum() if not df.empty else pd.DataFrame(columns=cols, dtype=float)
+        dataset_level = self._dataset_stage_frame()
+        index = per_file.index.union(dataset_level.index)
+        if len(index):
+            per_file = per_file.reindex(index, fill_value=0.0)
+            dataset_level = dataset_level.reindex(index, fill_value=0.0)
+            agg = per_file[list(STAGES)] + dataset_level[list(STAGES)]
+            agg.insert(0, 'total', per_file['total'] + dataset_level.sum(axis=1))
+            agg.insert(0, 'files', df.groupby('dataset').size().reindex(index, fill_value=0) if not df.empty else 0)
+            agg['dataset_level'] = dataset_level.sum(axis=1)
+            lines.append("\nPer-dataset (s):")
+            lines.append(agg.sort_values('total', ascending=False).round(3).to_string())
+
+        if df.empty:
+            lines.append("\nNo files profiled.")
+            return "\n".join(lines)
+
+        lines.append(f"\nSlowest {top_n} files (s):")
+        slowest = df.sort_values('total', ascending=False).head(top_n)
+        lines.append(slowest[['total', *STAGES, 'file']].round(3).to_string(index=False))
+        return "\n".join(lines)
+
+    def write(self, output_dir: str) -> None:
+        """Write summary.txt, file_timings.csv and trace.json to output_dir"""
+        if not self.enabled:
+            return
+        out = Path(output_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        report = self.summary()
+        (out / "summary.txt").write_text(report, encoding="utf-8")
+        self._frame().to_csv(out / "file_timings.csv", index=False)
+        with open(out / "trace.json", 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.events, 'displayTimeUnit': 'ms'}, f)
+        self.logger.info("\n" + report)
+        self.logger.info(f"Profile written to {out} (open trace.json in chrome://tracing or ui.perfetto.dev)")
+
+
+class StackSampler:
+    """Sample the target thread's Python stack every `interval` seconds"""
+
+    def __init__(self, interval: float = 0.005, thread_id: Optional[int] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.interval = interval
+        self.logger = logger or _default_logger
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write(self, path: str) -> None:
+        """Write collapsed stacks ('a;b;c count' per line)"""
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        self.logger.info(f"{sum(self.samples.values())} stack samples written to {path} (open in speedscope.app)")
+
+
+class DebugTextSink:
+    """Batched, size-capped JSONL sink for extracted debug text; no-op unless enabled"""
+
+    def __init__(self, directory: Path, enabled: bool = False, batch_size: int = 200,
+                 max_bytes: int = 50 * 1024 * 1024, logger: Optional[logging.Logger] = None):
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.logger = logger or _default_logger
+        self.bytes_written = 0
+        self.dropped = 0
+        self._buffer: List[str] = []
+        self._buffered_bytes = 0
+        self.path: Optional[Path] = None
+        self.configure(enabled, max_bytes)
+
+    def configure(self, enabled: bool, max_bytes: Optional[int] = None) -> None:
+        """Turn the sink on or off; a new output file is created when enabled"""
+        self.flush()
+        self.enabled = enabled
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if enabled:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            timestamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+            self.path = self.directory / f"extracted_text_{timestamp}.jsonl"
+            self.bytes_written = 0
+            self.dropped = 0
+
+    def write(self, file_path: str, text: str, name: Optional[str] = None) -> None:
+        if not self.enabled or not text:
+            return
+        line = json.dumps({'file': file_path, 'name': name or Path(file_path).name, 'text': text},
+                          ensure_ascii=False) + "\n"
+        size = len(line.encode('utf-8'))
+        if self.bytes_written + self._buffered_bytes + size > self.max_bytes:
+            if self.dropped == 0:
+                self.logger.warning(f"Debug text cap of {self.max_bytes} bytes reached; dropping further dumps")
+            self.dropped += 1
+            return
+        self._buffer.append(line)
+        self._buffered_bytes += size
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.writelines(self._buffer)
+        except Exception as e:
+            self.logger.warning(f"Failed to write {len(self._buffer)} debug text dumps to {self.path}: {e}")
+            self.dropped += len(self._buffer)
+        else:
+            self.bytes_written += self._buffered_bytes
+        self._buffer = []
+        self._buffered_bytes = 0
+
+    def close(self) -> None:
+        if not self.enabled:
+            return
+        self.flush()
+        self.logger.info(f"Debug text: {self.bytes_written / 1024 / 1024:.2f} MB written to {self.path}"
+                    + (f", {self.dropped} dumps dropped (size cap or write errors)" if self.dropped else ""))
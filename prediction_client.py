@@ -0,0 +1,407 @@
+"""
+Client for the Resume Category Prediction API (FastAPI_Resume.py)
+
+- PredictionClient: keep-alive connection pool (requests.Session)
+- AsyncPredictionClient: asyncio variant built on httpx
+- Endpoint and timeouts are configurable (PREDICTION_API_URL env var or arguments)
+- Connection failures and 429/502/503/504 responses are retried with jittered
+  backoff (Retry-After is honored), within a total retry-time budget. Read
+  timeouts and 500s are not retried: the server may still be working, or the
+  request fails the same way every time.
+- predict_many() batches automatically through the /predict/batch endpoint
+
+Failures raise PredictionAPIError subclasses (transport, HTTP status, malformed
+response). They are ValueErrors, so existing `except ValueError` callers keep working.
+
+Run `python prediction_client.py` to compare throughput against the old
+one-request-per-call path using a local stub server.
+"""
+
+import os
+import time
+import random
+import asyncio
+import threading
+import requests
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, Sequence
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except Exception:
+    httpx = None
+
+# For Docker: http://localhost:8000, for K8s: http://localhost:5000
+DEFAULT_API_URL = os.environ.get("PREDICTION_API_URL", "http://localhost:5000")
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+DEFAULT_MAX_RETRY_TIME = 30.0
+DEFAULT_BATCH_SIZE = 32
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+
+# ============================================================================
+# ERRORS
+# ============================================================================
+
+class PredictionAPIError(ValueError):
+    """Base class for prediction API failures"""
+
+
+class PredictionTransportError(PredictionAPIError):
+    """Could not reach the server, or it did not answer in time"""
+
+
+class PredictionHTTPError(PredictionAPIError):
+    """Server answered with a non-200 status"""
+
+    def __init__(self, status_code: int, detail: str):
+        self.status_code = status_code
+        self.detail = detail
+        super().__init__(f"Error from Prediction Server: {status_code} - {detail}")
+
+
+class PredictionResponseError(PredictionAPIError):
+    """Server answered 200 but the body is not what the API returns"""
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def _backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt))"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _check_batch_size(batch_size: int) -> int:
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    return batch_size
+
+
+def _chunks(items: Sequence[str], size: int) -> List[List[str]]:
+    return [list(items[i:i + size]) for i in range(0, len(items), size)]
+
+
+def _json(response) -> dict:
+    try:
+        body = response.json()
+    except ValueError:
+        raise PredictionResponseError(f"Invalid JSON from Prediction Server: {response.text[:200]}")
+    if not isinstance(body, dict):
+        raise PredictionResponseError(f"Malformed response from Prediction Server: {response.text[:200]}")
+    return body
+
+
+def _parse_single(response) -> str:
+    return _json(response).get("Predicted Category", "Not Available")
+
+
+def _parse_batch(response, expected: int) -> List[str]:
+    categories = _json(response).get("Predicted Categories")
+    if not isinstance(categories, list) or len(categories) != expected:
+        raise PredictionResponseError(f"Malformed batch response from Prediction Server: {response.text[:200]}")
+    return categories
+
+
+class _RetryPolicy:
+    """Retry settings shared by the sync and async clients"""
+
+    def __init__(self, max_retries: int, backoff_base: float, backoff_cap: float, max_retry_time: float):
+        if max_retries < 0:
+            raise ValueError(f"max_retries must be >= 0, got {max_retries}")
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_retry_time = max_retry_time
+
+    def next_delay(self, attempt: int, started: float, retry_after: Optional[float] = None) -> Optional[float]:
+        """Seconds to wait before the next attempt, or None to give up"""
+        if attempt >= self.max_retries:
+            return None
+        delay = retry_after if retry_after is not None else _backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+        if time.monotonic() - started + delay > self.max_retry_time:
+            return None
+        return delay
+
+
+# ============================================================================
+# CLIENTS
+# ============================================================================
+
+class PredictionClient:
+    """Synchronous client with pooled keep-alive connections (one instance per thread)"""
+
+    def __init__(self, base_url: str = DEFAULT_API_URL, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT, max_retries: int = 3,
+                 backoff_base: float = 0.2, backoff_cap: float = 5.0,
+                 max_retry_time: float = DEFAULT_MAX_RETRY_TIME,
+                 batch_size: int = DEFAULT_BATCH_SIZE, pool_size: int = 10):
+        self.retry = _RetryPolicy(max_retries, backoff_base, backoff_cap, max_retry_time)
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.batch_size = _check_batch_size(batch_size)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def _post(self, path: str, payload: dict):
+        url = f"{self.base_url}{path}"
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                response = self.session.post(url, json=payload, timeout=self.timeout)
+            except requests.ReadTimeout as e:
+                # The server may still be working on it; don't pile on more requests
+                raise PredictionTransportError(f"API Error: {str(e)}")
+            except requests.ConnectionError as e:
+                error = PredictionTransportError(f"API Error: {str(e)}")
+            except requests.RequestException as e:
+                raise PredictionTransportError(f"API Error: {str(e)}")
+            else:
+                if response.status_code == 200:
+                    return response
+                error = PredictionHTTPError(response.status_code, response.text)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise error
+                retry_after = _retry_after_seconds(response.headers.get('Retry-After'))
+
+            delay = self.retry.next_delay(attempt, started, retry_after)
+            if delay is None:
+                raise error
+            time.sleep(delay)
+            attempt += 1
+
+    def predict(self, resume_text: str) -> str:
+        """Predict the category of a single resume"""
+        return _parse_single(self._post('/predict', {"resume_text": resume_text}))
+
+    def predict_many(self, resume_texts: Sequence[str]) -> List[str]:
+        """Predict categories for many resumes, batched through /predict/batch"""
+        if len(resume_texts) == 1:
+            return [self.predict(resume_texts[0])]
+        categories = []
+        for chunk in _chunks(resume_texts, self.batch_size):
+            response = self._post('/predict/batch', {"resume_texts": chunk})
+            categories.extend(_parse_batch(response, len(chunk)))
+        return categories
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncPredictionClient:
+    """Asyncio client built on httpx with pooled keep-alive connections"""
+
+    def __init__(self, base_url: str = DEFAULT_API_URL, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT, max_retries: int = 3,
+                 backoff_base: float = 0.2, backoff_cap: float = 5.0,
+                 max_retry_time: float = DEFAULT_MAX_RETRY_TIME,
+                 batch_size: int = DEFAULT_BATCH_SIZE, max_connections: int = 10):
+        if httpx is None:
+            raise ModuleNotFoundError("httpx is required for AsyncPredictionClient (pip install httpx)")
+        self.retry = _RetryPolicy(max_retries, backoff_base, backoff_cap, max_retry_time)
+        self.base_url = base_url.rstrip('/')
+        self.batch_size = _check_batch_size(batch_size)
+        self.max_connections = max_connections
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+
+    async def _post(self, path: str, payload: dict):
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                response = await self.client.post(path, json=payload)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError) as e:
+                error = PredictionTransportError(f"API Error: {str(e)}")
+            except httpx.TransportError as e:
+                # Read/write timeouts included: the server may still be working on it
+                raise PredictionTransportError(f"API Error: {str(e)}")
+            else:
+                if response.status_code == 200:
+                    return response
+                error = PredictionHTTPError(response.status_code, response.text)
+                if response.status_code not in RETRY_STATUS_CODES:
+                    raise error
+                retry_after = _retry_after_seconds(response.headers.get('Retry-After'))
+
+            delay = self.retry.next_delay(attempt, started, retry_after)
+            if delay is None:
+                raise error
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def predict(self, resume_text: str) -> str:
+        """Predict the category of a single resume"""
+        return _parse_single(await self._post('/predict', {"resume_text": resume_text}))
+
+    async def predict_many(self, resume_texts: Sequence[str]) -> List[str]:
+        """Predict categories for many resumes, sending batches concurrently"""
+        if len(resume_texts) == 1:
+            return [await self.predict(resume_texts[0])]
+        semaphore = asyncio.Semaphore(self.max_connections)
+
+        async def send(chunk):
+            async with semaphore:
+                response = await self._post('/predict/batch', {"resume_texts": chunk})
+                return _parse_batch(response, len(chunk))
+
+        results = await asyncio.gather(*(send(c) for c in _chunks(resume_texts, self.batch_size)))
+        return [category for chunk in results for category in chunk]
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+_DEFAULT_CLIENTS = threading.local()
+
+
+def get_default_client() -> PredictionClient:
+    """Per-thread shared client so repeated calls reuse connections.
+
+    requests.Session is not thread-safe, and Streamlit runs each user session
+    in its own script thread, so every thread gets its own client.
+    """
+    client = getattr(_DEFAULT_CLIENTS, 'client', None)
+    if client is None:
+        client = PredictionClient()
+        _DEFAULT_CLIENTS.client = client
+    return client
+
+
+# ============================================================================
+# THROUGHPUT BENCHMARK (local stub server)
+# ============================================================================
+
+def _serve_stub(latency: float, port_queue) -> None:
+    """HTTP server mimicking /predict and /predict/batch (runs in its own process)"""
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Buffer headers + body into one write so keep-alive isn't stalled by delayed ACKs
+        wbufsize = 1 << 16
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            if latency:
+                time.sleep(latency)
+            if self.path == '/predict':
+                result = {"Predicted Category": "Data Science"}
+            elif self.path == '/predict/batch':
+                result = {"Predicted Categories": ["Data Science"] * len(body["resume_texts"])}
+            else:
+                self.send_error(404)
+                return
+            data = json.dumps(result).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def _start_stub_server(latency: float = 0.0):
+    """Start the stub server in a separate process so it doesn't share the client's GIL"""
+    import multiprocessing
+
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve_stub, args=(latency, port_queue), daemon=True)
+    process.start()
+    return process, f"http://127.0.0.1:{port_queue.get(timeout=10)}"
+
+
+def benchmark(n_texts: int = 500, latency: float = 0.01) -> dict:
+    """Resumes per second for the old per-call path vs the pooled/batched/async clients"""
+    server, base_url = _start_stub_server(latency)
+    texts = [f"Sample resume {i} python machine learning data science" for i in range(n_texts)]
+    results = {}
+    try:
+        # Old utils.get_prediction_api: fresh requests.post per resume
+        start = time.perf_counter()
+        for text in texts:
+            requests.post(f"{base_url}/predict", json={"resume_text": text}, timeout=60)
+        results['legacy requests.post'] = n_texts / (time.perf_counter() - start)
+
+        with PredictionClient(base_url) as client:
+            start = time.perf_counter()
+            for text in texts:
+                client.predict(text)
+            results['pooled, one per call'] = n_texts / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            client.predict_many(texts)
+            results['pooled, batched'] = n_texts / (time.perf_counter() - start)
+
+        if httpx is not None:
+            async def run_async():
+                async with AsyncPredictionClient(base_url) as client:
+                    start = time.perf_counter()
+                    await asyncio.gather(*(client.predict(t) for t in texts))
+                    single = n_texts / (time.perf_counter() - start)
+                    start = time.perf_counter()
+                    await client.predict_many(texts)
+                    batched = n_texts / (time.perf_counter() - start)
+                return single, batched
+
+            results['async, concurrent'], results['async, batched'] = asyncio.run(run_async())
+    finally:
+        server.terminate()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Throughput of prediction clients against a local stub server")
+    parser.add_argument('--n', type=int, default=500, help="Number of resumes to submit")
+    parser.add_argument('--latency', type=float, default=0.01, help="Simulated server latency per request (s)")
+    args = parser.parse_args()
+
+    for name, rate in benchmark(args.n, args.latency).items():
+        print(f"{name:<24} {rate:8.0f} resumes/s")
@@ -4,8 +4,8 @@ import docx
 import pickle
 import numpy as np
 import PyPDF2
-import requests
 from PIL import Image
+from prediction_client import get_default_client
 
 try:
     from rapidocr_onnxruntime import RapidOCR
@@ -122,19 +122,9 @@ def handle_file_upload(uploaded_file):
 
 
 # Function to get prediction from FastAPI server
+# Endpoint comes from PREDICTION_API_URL (Docker: http://localhost:8000, K8s: http://localhost:5000)
 def get_prediction_api(resume_text):
-    # For Docker 
-    # Fast_API_URL = "http://localhost:8000/predict"
-    # For K8s
-    Fast_API_URL = "http://localhost:5000/predict"
-    try:
-        response = requests.post(Fast_API_URL, json={"resume_text": resume_text}, timeout=60)
-        if response.status_code == 200:
-            return response.json().get("Predicted Category", "Not Available")
-        else:
-            raise ValueError(f"Error from Prediction Server: {response.status_code} - {response.text}")
-    except Exception as e:
-        raise ValueError(f"API Error: {str(e)}")
+    return get_default_client().predict(resume_text)
 
 # Function to get prediction using local model
 def get_prediction(resume_text):